@@ -30,9 +30,16 @@ AXIS_COLORS = {
 TIME_COLUMN = "Channel name"
 AXIS_COLUMNS = ["X", "Y", "Z"]
 
+# Data types used when loading
+# Time stays float64 so long recordings keep sub-sample precision.
+# Vibration axes use float32: plenty for ADC data, and half the memory.
+TIME_DTYPE = "float64"
+AXIS_DTYPE = "float32"
+
 # FFT Configuration
+# Axis data arrives as AXIS_DTYPE (float32), so spectra are float32 too
 FFT_CONFIG = {
-    "nperseg": 1024,        # Window size for Welch's method (power of 2)
+    "nperseg": 1024,        # Window size for Welch's method (rounded up to a power of 2)
     "max_frequency": None,  # Max frequency to display (None = auto, up to Nyquist)
     "freq_units": "Hz",
     "mag_units": "Acceleration (g)",
@@ -69,6 +76,29 @@ PDF_CONFIG = {
     "hspace": 0.3,  # Vertical space
     "wspace": 0.15,  # Horizontal space
     
+    # Figure margins (fractions of the figure size)
+    # Set once up front, so saving needs no extra layout pass;
+    # "top" leaves room for the overall title
+    "margins": {"left": 0.04, "right": 0.99, "bottom": 0.05, "top": 0.92},
+    
     # Rasterization (converts plots to pixels for smaller file size)
     "rasterized": True,
-}
\ No newline at end of file
+    
+    # Bounding box passed to savefig
+    # None = save the full figure in a single render pass
+    # "tight" = trim whitespace, but renders the figure twice
+    "bbox_inches": None,
+}
+
+# Data Cache Configuration
+CACHE_CONFIG = {
+    # Cache each condition's concatenated data as a Parquet file
+    # Repeat runs on unchanged CSVs skip CSV parsing entirely
+    "enabled": True,
+    
+    # Where cached Parquet files are written
+    "directory": Path("output") / "cache",
+    
+    # Parquet compression codec (zstd = small files, fast to read)
+    "compression": "zstd",
+}
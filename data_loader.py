@@ -2,15 +2,53 @@
 Module for loading and concatenating CSV files from the data directory.
 """
 
+import functools
+import glob
+import hashlib
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 import logging
+import os
+import tempfile
+
+from config import CACHE_CONFIG, TIME_COLUMN, AXIS_COLUMNS, TIME_DTYPE, AXIS_DTYPE
 
 # Setup logging to track what's happening
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of files/conditions loaded at the same time
+MAX_LOAD_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=64)
+def _find_csv_files_cached(directory: str, mtime_ns: int) -> Tuple[Path, ...]:
+    """
+    Scan a directory for CSV files, memoized per directory and mtime.
+    
+    Args:
+        directory: Directory to search, as a string
+        mtime_ns: Directory modification time (part of the cache key only)
+        
+    Returns:
+        Tuple of CSV file paths, sorted by name
+    """
+    # os.scandir reuses the directory listing's file type info,
+    # avoiding an extra stat call per entry
+    with os.scandir(directory) as entries:
+        csv_paths = sorted(
+            entry.path for entry in entries
+            if entry.name.endswith(".csv") and entry.is_file()
+        )
+    return tuple(Path(path) for path in csv_paths)
+
 
 def find_csv_files(directory: Path) -> List[Path]:
     """
@@ -22,58 +60,362 @@ def find_csv_files(directory: Path) -> List[Path]:
     Returns:
         List of Path objects pointing to CSV files, sorted by name
     """
-    csv_files = sorted(directory.glob("*.csv"))
-    logger.info(f"Found {len(csv_files)} CSV files in {directory.name}")
+    # A directory's mtime changes whenever files are added, removed or renamed
+    csv_files = list(_find_csv_files_cached(str(directory), directory.stat().st_mtime_ns))
+    logger.info("Found %d CSV files in %s", len(csv_files), directory.name)
     return csv_files
 
 
-def load_and_concatenate_csvs(csv_files: List[Path]) -> pd.DataFrame:
+def _cache_key(csv_files: List[Path]) -> str:
+    """
+    Build a cache key that changes whenever any input CSV changes.
+    
+    Hashes each file's path, modification time and size, so editing,
+    adding or removing a CSV produces a new key. The parse schema (column
+    names and dtypes from config) is hashed too, so changing it never
+    reuses a cache file written with the old schema.
+    
+    Args:
+        csv_files: List of CSV file paths
+        
+    Returns:
+        Hex digest identifying this exact set of files
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    schema = ",".join(
+        [f"{TIME_COLUMN}:{TIME_DTYPE}", *(f"{axis}:{AXIS_DTYPE}" for axis in AXIS_COLUMNS)]
+    )
+    hasher.update(f"{schema}\n".encode("utf-8"))
+    for csv_file in csv_files:
+        stat = csv_file.stat()
+        hasher.update(f"{csv_file.resolve()}|{stat.st_mtime_ns}|{stat.st_size}\n".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _read_csv_table(csv_file: Path) -> pa.Table:
+    """
+    Read a single CSV file into a PyArrow Table.
+    
+    Uses PyArrow's multi-threaded CSV parser, with column types declared
+    up front so no per-file type inference is needed. Only the time and
+    axis columns are parsed; time is read as TIME_DTYPE and vibration
+    axes as AXIS_DTYPE (see config.py).
+    
+    Args:
+        csv_file: Path to the CSV file
+        
+    Returns:
+        PyArrow Table with the file's contents
+    """
+    logger.info("  [%s] Loading: %s", csv_file.parent.name, csv_file.name)
+    
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+    convert_options = pacsv.ConvertOptions(
+        # Only parse the columns used downstream
+        include_columns=[TIME_COLUMN, *AXIS_COLUMNS],
+        column_types={
+            TIME_COLUMN: pa.type_for_alias(TIME_DTYPE),
+            **{axis: pa.type_for_alias(AXIS_DTYPE) for axis in AXIS_COLUMNS},
+        }
+    )
+    
+    return pacsv.read_csv(
+        csv_file,
+        read_options=read_options,
+        convert_options=convert_options
+    )
+
+
+def _iter_time_offsets(tables: List[pa.Table]) -> Iterator[Tuple[pa.Table, float]]:
+    """
+    Yield each table with the offset that makes its time continuous.
+    
+    Each file is offset by the end time of all previous files (time is
+    increasing, so the last value is the max; if the last time cell is
+    blank, the largest valid time is used instead). Tables are removed from
+    the list as they are yielded, so each one can be freed as soon as
+    the caller has copied it. Empty tables are skipped.
+    
+    Args:
+        tables: Per-file tables in time order (emptied by this generator)
+        
+    Yields:
+        (table, time_offset) pairs
+    """
+    time_offset = 0.0
+    tables.reverse()
+    
+    while tables:
+        table = tables.pop()
+        if table.num_rows == 0:
+            continue
+        
+        yield table, time_offset
+        
+        time_column = table.column(TIME_COLUMN)
+        end_time = time_column[-1].as_py()
+        if end_time is None:
+            # Blank cells are read as nulls, which max() skips
+            end_time = pc.max(time_column).as_py()
+        if end_time is not None:
+            time_offset += end_time
+
+
+def _build_dataframe(time_values: np.ndarray, axis_values: np.ndarray) -> pd.DataFrame:
+    """
+    Wrap time and axis arrays in a DataFrame without copying them.
+    
+    The axes stay together as one 2-D block, so
+    df[AXIS_COLUMNS].to_numpy(copy=False) is a view (one contiguous
+    column per axis) rather than a copy of every axis.
+    
+    Args:
+        time_values: Time column
+        axis_values: Axis data, shape (n_axes, n_rows) in AXIS_COLUMNS order
+        
+    Returns:
+        DataFrame with the time and axis columns
+    """
+    df = pd.DataFrame(axis_values.T, columns=AXIS_COLUMNS, copy=False)
+    df.insert(0, TIME_COLUMN, time_values)
+    return df
+
+
+def _read_parquet_cache(cache_path: Path) -> pd.DataFrame:
+    """
+    Read a cached condition from its Parquet file.
+    
+    Args:
+        cache_path: Path to the Parquet cache file
+        
+    Returns:
+        DataFrame with the time and axis columns
+    """
+    table = pq.read_table(cache_path, columns=[TIME_COLUMN, *AXIS_COLUMNS])
+    
+    time_values = table.column(TIME_COLUMN).to_numpy().astype(TIME_DTYPE, copy=False)
+    axis_values = np.empty((len(AXIS_COLUMNS), table.num_rows), dtype=AXIS_DTYPE)
+    for axis_idx, axis in enumerate(AXIS_COLUMNS):
+        axis_values[axis_idx] = table.column(axis).to_numpy()
+    
+    return _build_dataframe(time_values, axis_values)
+
+
+def _write_parquet_cache(tables: List[pa.Table], cache_path: Path):
+    """
+    Stream per-file tables into a Parquet cache file, one file at a time.
+    
+    Each table's time column is made continuous before it is written, so
+    the combined data never has to exist in memory at once. The file is
+    written under a unique temporary name and renamed when complete, so
+    an interrupted run never leaves a partial cache file behind, and two
+    runs caching the same data at once never write into the same file.
+    
+    Args:
+        tables: Per-file tables in time order (emptied by this function)
+        cache_path: Path of the Parquet cache file to create
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, partial_name = tempfile.mkstemp(
+        dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".partial"
+    )
+    os.close(fd)
+    partial_path = Path(partial_name)
+    
+    schema = tables[0].schema
+    time_index = schema.get_field_index(TIME_COLUMN)
+    
+    try:
+        with pq.ParquetWriter(partial_path, schema, compression=CACHE_CONFIG["compression"]) as writer:
+            for table, time_offset in _iter_time_offsets(tables):
+                table = table.set_column(
+                    time_index,
+                    TIME_COLUMN,
+                    pa.array(table.column(TIME_COLUMN).to_numpy() + time_offset)
+                )
+                writer.write_table(table)
+        
+        partial_path.replace(cache_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+
+
+def _concatenate_tables(tables: List[pa.Table]) -> pd.DataFrame:
+    """
+    Combine per-file tables into one DataFrame with continuous time.
+    
+    Copies every file straight into one pre-allocated array per column,
+    instead of concatenating (which would hold two full copies at once).
+    Each axis gets its own contiguous row of axis_values, and each file's
+    table is released once it has been copied.
+    
+    Args:
+        tables: Per-file tables in time order (emptied by this function)
+        
+    Returns:
+        Combined DataFrame
+    """
+    total_rows = sum(table.num_rows for table in tables)
+    time_values = np.empty(total_rows, dtype=TIME_DTYPE)
+    axis_values = np.empty((len(AXIS_COLUMNS), total_rows), dtype=AXIS_DTYPE)
+    
+    start = 0
+    for table, time_offset in _iter_time_offsets(tables):
+        end = start + table.num_rows
+        
+        np.add(table.column(TIME_COLUMN).to_numpy(), time_offset, out=time_values[start:end])
+        for axis_idx, axis in enumerate(AXIS_COLUMNS):
+            axis_values[axis_idx, start:end] = table.column(axis).to_numpy()
+        
+        start = end
+    
+    return _build_dataframe(time_values, axis_values)
+
+
+def _remove_stale_caches(cache_path: Path, condition: str):
+    """
+    Delete a condition's older cache files, keeping only cache_path.
+    
+    Every change to the CSVs produces a new cache key, so without this
+    the cache directory would grow by a full copy of the data each time.
+    
+    Args:
+        cache_path: The condition's current cache file
+        condition: Condition name the cache files are labelled with
+    """
+    # Match "<condition>_<32 hex digits>.parquet" exactly, so conditions
+    # whose names share a prefix don't delete each other's files
+    pattern = f"{glob.escape(condition)}_{'?' * 32}.parquet"
+    for stale_path in cache_path.parent.glob(pattern):
+        if stale_path != cache_path:
+            stale_path.unlink(missing_ok=True)
+            logger.info("  [%s] Removed stale cache: %s", condition, stale_path.name)
+
+
+def load_and_concatenate_csvs(csv_files: List[Path], condition: str = "data") -> pd.DataFrame:
     """
     Load multiple CSV files and concatenate them into a single DataFrame.
     The time column is adjusted to be continuous across files.
     
+    When CACHE_CONFIG["enabled"] is set, the files are streamed into a
+    Parquet cache file, which is then read back and reused on later runs
+    while the CSVs are unchanged.
+    
     Args:
         csv_files: List of CSV file paths to load
+        condition: Condition name, used to label the cache file and log lines
         
     Returns:
         Concatenated DataFrame with continuous time
     """
     if not csv_files:
-        logger.warning("No CSV files provided")
+        logger.warning("[%s] No CSV files provided", condition)
         return pd.DataFrame()
     
-    dataframes = []
-    cumulative_time = 0.0
-    
-    for i, csv_file in enumerate(csv_files):
-        logger.info(f"  Loading: {csv_file.name}")
+    # Reuse cached data if these exact CSVs were loaded before
+    cache_path = None
+    if CACHE_CONFIG["enabled"]:
+        cache_dir = Path(CACHE_CONFIG["directory"])
+        cache_path = cache_dir / f"{condition}_{_cache_key(csv_files)}.parquet"
         
-        # Read CSV file
-        df = pd.read_csv(csv_file)
-        
-        # Adjust time to be continuous
-        if i > 0:
-            # Add the maximum time from previous files
-            df['Channel name'] = df['Channel name'] + cumulative_time
-        
-        # Update cumulative time for next file
-        cumulative_time = df['Channel name'].max()
-        
-        dataframes.append(df)
+        if cache_path.exists():
+            try:
+                cached_df = _read_parquet_cache(cache_path)
+                logger.info("  [%s] Loading from cache: %s", condition, cache_path.name)
+                return cached_df
+            except (pa.ArrowInvalid, OSError) as exc:
+                # Unreadable (e.g. truncated) cache: drop it and re-parse
+                logger.warning("  [%s] Ignoring unreadable cache %s: %s", condition, cache_path.name, exc)
+                cache_path.unlink(missing_ok=True)
+    
+    # Parse all files in parallel (PyArrow releases the GIL while parsing)
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(csv_files))) as executor:
+        tables = list(executor.map(_read_csv_table, csv_files))
     
-    # Concatenate all dataframes
-    combined_df = pd.concat(dataframes, ignore_index=True)
+    if cache_path is not None:
+        # Write the cache file, then load from it
+        _write_parquet_cache(tables, cache_path)
+        logger.info("  [%s] Cached to: %s", condition, cache_path.name)
+        _remove_stale_caches(cache_path, condition)
+        combined_df = _read_parquet_cache(cache_path)
+    else:
+        combined_df = _concatenate_tables(tables)
     
-    logger.info(f"  Total data points: {len(combined_df)}")
-    logger.info(f"  Time range: {combined_df['Channel name'].min():.4f} to {combined_df['Channel name'].max():.4f}")
+    logger.info("  [%s] Total data points: %d", condition, len(combined_df))
+    if not combined_df.empty:
+        logger.info(
+            "  [%s] Time range: %.4f to %.4f",
+            condition,
+            combined_df[TIME_COLUMN].iat[0],
+            combined_df[TIME_COLUMN].iat[-1]
+        )
     
     return combined_df
 
 
+def _load_condition(condition_path: Path, condition: str) -> pd.DataFrame:
+    """
+    Find and load all CSV files for one condition.
+    
+    Args:
+        condition_path: Folder containing the condition's CSV files
+        condition: Condition name
+        
+    Returns:
+        Concatenated DataFrame for the condition
+    """
+    logger.info("Loading condition: %s", condition)
+    
+    csv_files = find_csv_files(condition_path)
+    return load_and_concatenate_csvs(csv_files, condition)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_all_conditions_cached(data_root: Path,
+                                conditions: Tuple[str, ...],
+                                fingerprint: Tuple[str, ...]) -> Dict[str, pd.DataFrame]:
+    """
+    Load the given conditions, memoized for the lifetime of the process.
+    
+    Args:
+        data_root: Root directory containing condition folders
+        conditions: Condition names whose folders exist
+        fingerprint: Cache keys of each condition's CSV files (part of
+            the memoization key only, so changed CSVs are reloaded)
+        
+    Returns:
+        Dictionary mapping condition names to DataFrames
+    """
+    # Load conditions in parallel, keeping the requested order. Threads
+    # (not processes): PyArrow releases the GIL while parsing, log records
+    # reach the handlers set up by setup_logging, and the DataFrames don't
+    # have to be pickled back to this process.
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(conditions))) as executor:
+        frames = list(executor.map(
+            _load_condition,
+            [data_root / condition for condition in conditions],
+            conditions
+        ))
+    
+    all_data = {}
+    for condition, df in zip(conditions, frames):
+        if not df.empty:
+            all_data[condition] = df
+    
+    return all_data
+
+
 def load_all_conditions(data_root: Path, conditions: List[str]) -> Dict[str, pd.DataFrame]:
     """
     Load data for all experimental conditions.
     
+    Results are memoized in-process: loading the same unchanged data
+    again (e.g. HTML then PDF export in one session) reuses the parsed
+    DataFrames. Across processes, the Parquet cache serves the same role.
+    The returned DataFrames are shared between calls, so treat them as
+    read-only.
+    
     Args:
         data_root: Root directory containing condition folders
         conditions: List of condition names (folder names)
@@ -81,25 +423,30 @@ def load_all_conditions(data_root: Path, conditions: List[str]) -> Dict[str, pd.
     Returns:
         Dictionary mapping condition names to DataFrames
     """
-    all_data = {}
+    data_root = Path(data_root)
     
+    # Skip conditions that have no folder
+    existing = []
     for condition in conditions:
-        condition_path = data_root / condition
-        
-        if not condition_path.exists():
-            logger.warning(f"Condition directory not found: {condition}")
+        if not (data_root / condition).exists():
+            logger.warning("Condition directory not found: %s", condition)
             continue
-        
-        logger.info(f"Loading condition: {condition}")
-        
-        # Find and load all CSV files for this condition
-        csv_files = find_csv_files(condition_path)
-        df = load_and_concatenate_csvs(csv_files)
-        
-        if not df.empty:
-            all_data[condition] = df
+        existing.append(condition)
     
-    return all_data
+    if not existing:
+        return {}
+    
+    # Identify the current CSV files of every condition (stat calls only)
+    fingerprint = tuple(
+        _cache_key(list(_find_csv_files_cached(
+            str(data_root / condition),
+            (data_root / condition).stat().st_mtime_ns
+        )))
+        for condition in existing
+    )
+    
+    # Copy the dict so callers can't change the memoized one
+    return dict(_load_all_conditions_cached(data_root, tuple(existing), fingerprint))
 
 
 # Quick test function to verify loading works
@@ -112,7 +459,7 @@ def test_loading(data_root: Path, condition: str):
     
     condition_path = data_root / condition
     csv_files = find_csv_files(condition_path)
-    df = load_and_concatenate_csvs(csv_files)
+    df = load_and_concatenate_csvs(csv_files, condition)
     
     print(f"\nDataFrame shape: {df.shape}")
     print(f"\nFirst few rows:")
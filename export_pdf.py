@@ -3,6 +3,11 @@ Standalone PDF export script using Matplotlib.
 Run this separately from the main HTML generation.
 """
 
+# Use the non-interactive Agg backend (fastest, no GUI autodetection).
+# Must be set before anything imports matplotlib.pyplot.
+import matplotlib
+matplotlib.use("Agg")
+
 import logging
 import sys
 from pathlib import Path
@@ -57,14 +62,14 @@ def main(data_path: Path = None):
     
     print("STEP 2: COMPUTING FREQUENCY SPECTRA")
     
-    all_spectra = compute_all_frequency_spectra(
+    all_spectra, spectra_meta = compute_all_frequency_spectra(
         all_data=all_data,
         time_column=TIME_COLUMN,
         axis_columns=AXIS_COLUMNS,
         fft_config=FFT_CONFIG
     )
     
-    max_freq = get_frequency_display_range(all_spectra, FFT_CONFIG)
+    max_freq = get_frequency_display_range(spectra_meta, FFT_CONFIG)
     
     print(f"\n✅ Computed spectra for {len(all_spectra)} conditions")
     
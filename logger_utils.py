@@ -17,16 +17,23 @@ class DualOutput:
         self.log_file = log_file
         
     def write(self, message):
-        """Write to both terminal and file."""
+        """
+        Write to both terminal and file.
+        
+        The log file is opened line-buffered, so it needs no flush here.
+        The terminal is block-buffered when output is piped or redirected,
+        so it is flushed once per completed line (not per write() call)
+        to keep print() output in step with log lines and stderr.
+        """
         # Always write to terminal
         self.terminal.write(message)
-        self.terminal.flush()
+        if "\n" in message:
+            self.terminal.flush()
         
         # Write to log file if message is not completely empty
         # This includes newlines (\n), spaces, and actual text
         if message:  # Changed from message.strip()
             self.log_file.write(message)
-            self.log_file.flush()
     
     def flush(self):
         """Flush both outputs."""
@@ -59,8 +66,8 @@ def setup_logging(output_dir: Path = None, log_filename: str = "log.txt"):
     # Full path to log file
     log_path = output_dir / log_filename
     
-    # Open log file
-    log_file = open(log_path, 'w', encoding='utf-8')
+    # Open log file (line-buffered, so each line reaches disk as it is written)
+    log_file = open(log_path, 'w', encoding='utf-8', buffering=1)
     
     # Clear any existing handlers
     root_logger = logging.getLogger()
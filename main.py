@@ -2,11 +2,15 @@
 Main script to run the vibration data analysis and plotting.
 """
 
+import hashlib
 import logging
+import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Import our modules
+import config
 from config import (
     DATA_ROOT, CONDITIONS, PLOT_CONFIG, AXIS_COLORS, 
     TIME_COLUMN, AXIS_COLUMNS, FFT_CONFIG
@@ -20,19 +24,102 @@ from logger_utils import setup_logging
 logger = logging.getLogger(__name__)
 
 
-def main(data_path: Path = None):
+def _input_fingerprint(inputs: List[Path]) -> Optional[str]:
+    """
+    Build a fingerprint of the inputs the plots are built from.
+    
+    Hashes the resolved path, modification time and size of each input
+    file and of every CSV under each input directory, so switching to
+    another dataset, or editing, adding, removing or renaming a CSV,
+    changes the fingerprint. Symlinked directories are not followed, so
+    a symlink cycle can't make the walk loop forever.
+    
+    Args:
+        inputs: Input files, or data directories containing CSV files
+        
+    Returns:
+        Hex digest of the inputs, or None if an input is missing or unreadable
+    """
+    entries = []
+    try:
+        for path in inputs:
+            path = path.resolve()
+            if path.is_file():
+                stat = path.stat()
+                entries.append(f"{path}|{stat.st_mtime_ns}|{stat.st_size}")
+                continue
+            
+            # The data root itself is part of the fingerprint, even if empty
+            entries.append(f"{path}|dir")
+            pending = [str(path)]
+            while pending:
+                with os.scandir(pending.pop()) as scan:
+                    for entry in scan:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.endswith(".csv"):
+                            stat = entry.stat()
+                            entries.append(f"{entry.path}|{stat.st_mtime_ns}|{stat.st_size}")
+    except OSError:
+        return None
+    
+    hasher = hashlib.blake2b(digest_size=16)
+    for entry in sorted(entries):
+        hasher.update(f"{entry}\n".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _needs_rebuild(outputs: List[Path], stamp_path: Path,
+                   fingerprint: Optional[str]) -> bool:
+    """
+    Check whether the output files are missing or were built from other inputs.
+    
+    Args:
+        outputs: Files produced by the pipeline
+        stamp_path: File holding the input fingerprint of the last build
+        fingerprint: Current input fingerprint (None if inputs are unreadable)
+        
+    Returns:
+        True if the pipeline has to run again
+    """
+    if fingerprint is None:
+        return True
+    
+    if not all(output.exists() for output in outputs) or not stamp_path.exists():
+        return True
+    
+    return stamp_path.read_text(encoding="utf-8").strip() != fingerprint
+
+
+def main(data_path: Path = None, force: bool = False):
     """
     Main function to execute the complete analysis pipeline.
     
+    The pipeline is skipped when both HTML plots already exist and were
+    built from the same data directory, with the same CSVs (paths,
+    modification times and sizes), and the same config.py.
+    
     Args:
         data_path: Optional path to data directory. If None, uses DATA_ROOT from config.
+        force: Rebuild the plots even if they are up to date
     """
     # Use provided path or default from config
     if data_path is None:
         data_path = DATA_ROOT
     
-    # Setup logging to file and console 
     output_dir = Path("output")
+    time_output = output_dir / "time_domain.html"
+    freq_output = output_dir / "frequency_domain.html"
+    stamp_path = output_dir / "plots.stamp"
+    
+    # Nothing to do if the plots were built from exactly these inputs
+    fingerprint = _input_fingerprint([Path(data_path), Path(config.__file__)])
+    if not force and not _needs_rebuild([time_output, freq_output], stamp_path, fingerprint):
+        print("✅ Plots are up to date with the data, nothing to do.")
+        print("   Run with --force to rebuild anyway.")
+        return
+    
+    # Setup logging to file and console 
     log_path = setup_logging(output_dir, "log.txt")
     
     print(f"Using data path: {data_path}")
@@ -50,7 +137,7 @@ def main(data_path: Path = None):
     
     print("STEP 2: COMPUTING FREQUENCY SPECTRA (FFT)")
     
-    all_spectra = compute_all_frequency_spectra(
+    all_spectra, spectra_meta = compute_all_frequency_spectra(
         all_data=all_data,
         time_column=TIME_COLUMN,
         axis_columns=AXIS_COLUMNS,
@@ -58,7 +145,7 @@ def main(data_path: Path = None):
     )
     
     # Determine frequency display range
-    max_freq = get_frequency_display_range(all_spectra, FFT_CONFIG)
+    max_freq = get_frequency_display_range(spectra_meta, FFT_CONFIG)
     
     print(f"\n✅ Successfully computed spectra for {len(all_spectra)} conditions")
     
@@ -90,15 +177,17 @@ def main(data_path: Path = None):
     output_dir.mkdir(exist_ok=True)
     
     # Save time domain plot
-    time_output = output_dir / "time_domain.html"
-    time_fig.write_html(str(time_output))
+    time_fig.write_html(str(time_output), validate=False)  # Already validated while building
     print(f"\n✅ Time domain plot saved to: {time_output}")
     
     # Save frequency domain plot
-    freq_output = output_dir / "frequency_domain.html"
-    freq_fig.write_html(str(freq_output))
+    freq_fig.write_html(str(freq_output), validate=False)
     print(f"✅ Frequency domain plot saved to: {freq_output}")
     
+    # Record which inputs these plots were built from
+    if fingerprint is not None:
+        stamp_path.write_text(fingerprint + "\n", encoding="utf-8")
+    
     print("COMPLETE")
     print("\nGenerated files:")
     print(f"  📈 Time Domain:      {time_output}")
@@ -113,14 +202,19 @@ def main(data_path: Path = None):
 
 
 if __name__ == "__main__":
+    # --force rebuilds even when the plots are up to date
+    args = sys.argv[1:]
+    force = "--force" in args
+    args = [arg for arg in args if arg != "--force"]
+    
     # Check for command-line argument
-    if len(sys.argv) > 1:
+    if args:
         # Use provided path
-        custom_path = Path(sys.argv[1])
+        custom_path = Path(args[0])
         if not custom_path.exists():
             print(f"❌ Path does not exist: {custom_path}")
             sys.exit(1)
-        main(data_path=custom_path)
+        main(data_path=custom_path, force=force)
     else:
         # Use default path from config
-        main()
\ No newline at end of file
+        main(force=force)
\ No newline at end of file
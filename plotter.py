@@ -3,48 +3,57 @@ Module for creating interactive plots using Plotly.
 """
 
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 from typing import Dict, List, Tuple
 import numpy as np
 
+from _kernels import column_ranges
+from signal_processor import get_frequency_cutoff
+
+# Serialise figures with orjson (much faster than the standard json
+# module for large numpy traces), used by write_html/to_json/show
+pio.json.config.default_engine = 'orjson'
+
 
 def calculate_global_ranges(all_data: Dict[str, pd.DataFrame], 
-                           axes: List[str]) -> Dict[str, Tuple[float, float]]:
+                           axes: List[str],
+                           verbose: bool = False) -> Dict[str, Tuple[float, float]]:
     """
     Calculate global min/max ranges across all conditions for consistent scaling.
     
     Args:
         all_data: Dictionary of condition name to DataFrame
         axes: List of axis names to calculate ranges for (e.g., ['X', 'Y', 'Z'])
+        verbose: Print the range of each axis
         
     Returns:
         Dictionary mapping axis names to (min, max) tuples
     """
     ranges = {}
     
-    for axis in axes:
-        all_values = []
-        
-        # Collect all values for this axis across all conditions
-        for df in all_data.values():
-            all_values.extend(df[axis].values)
-        
+    if verbose:
+        print("\n📏 Calculating global ranges for consistent scaling:")
+    
+    # One (n_rows, n_axes) array per condition (a view, no copy)
+    blocks = [df[axes].to_numpy(copy=False) for df in all_data.values()]
+    
+    for axis, (min_val, max_val) in zip(axes, column_ranges(blocks)):
         # Calculate global min/max with some padding
-        min_val = np.min(all_values)
-        max_val = np.max(all_values)
         padding = (max_val - min_val) * 0.05  # 5% padding
-        
         ranges[axis] = (min_val - padding, max_val + padding)
         
-        print(f"{axis}-axis range: [{ranges[axis][0]:.2f}, {ranges[axis][1]:.2f}]")
+        if verbose:
+            print(f"{axis}-axis range: [{ranges[axis][0]:.2f}, {ranges[axis][1]:.2f}]")
     
     return ranges
 
 
 def calculate_global_frequency_ranges(all_spectra: Dict[str, Dict],
                                      axes: List[str],
-                                     max_frequency: float) -> Dict[str, Tuple[float, float]]:
+                                     max_frequency: float,
+                                     verbose: bool = False) -> Dict[str, Tuple[float, float]]:
     """
     Calculate global magnitude ranges for frequency plots.
     
@@ -55,34 +64,34 @@ def calculate_global_frequency_ranges(all_spectra: Dict[str, Dict],
         all_spectra: Dictionary of frequency spectra for all conditions
         axes: List of axis names
         max_frequency: Maximum frequency to include
+        verbose: Print the magnitude range of each axis
         
     Returns:
         Dictionary mapping axis names to (min, max) magnitude tuples
     """
     ranges = {}
     
-    print("\n📏 Calculating global frequency ranges:")
+    if verbose:
+        print("\n📏 Calculating global frequency ranges:")
     
-    for axis in axes:
-        all_magnitudes = []
+    for axis_idx, axis in enumerate(axes):
+        peak_magnitudes = []
         
-        # Collect all magnitude values for this axis across all conditions
+        # Find the peak magnitude for this axis in each condition
         for spectrum in all_spectra.values():
-            frequencies = spectrum[axis]['frequencies']
-            magnitudes = spectrum[axis]['magnitude']
-            
             # Only include frequencies up to max_frequency
-            mask = frequencies <= max_frequency
-            all_magnitudes.extend(magnitudes[mask])
+            cutoff = get_frequency_cutoff(spectrum, max_frequency)
+            peak_magnitudes.append(spectrum['magnitudes'][:cutoff, axis_idx].max())
         
         # Calculate global min/max with padding
         min_mag = 0  # Magnitude can't be negative
-        max_mag = np.max(all_magnitudes)
+        max_mag = max(peak_magnitudes)
         padding = max_mag * 0.05  # 5% padding on top
         
         ranges[axis] = (min_mag, max_mag + padding)
         
-        print(f"{axis}-axis magnitude range: [0, {ranges[axis][1]:.4f}]")
+        if verbose:
+            print(f"{axis}-axis magnitude range: [0, {ranges[axis][1]:.4f}]")
     
     return ranges
 
@@ -118,21 +127,21 @@ def create_vibration_plot(all_data: Dict[str, pd.DataFrame],
     print(f"\n📊 Creating TIME DOMAIN plot: {n_conditions} rows × {n_axes} columns")
     
     # Calculate global ranges for consistent scaling
-    print("\n📏 Calculating global ranges for consistent scaling:")
     global_ranges = calculate_global_ranges(all_data, axis_columns)
     
     # Also calculate time range
-    all_times = []
-    for df in all_data.values():
-        all_times.extend(df[time_column].values)
-    time_range = (min(all_times), max(all_times))
+    time_range = (
+        min(df[time_column].to_numpy(copy=False).min() for df in all_data.values()),
+        max(df[time_column].to_numpy(copy=False).max() for df in all_data.values())
+    )
     print(f"Time range: [{time_range[0]:.4f}, {time_range[1]:.4f}] seconds")
     
     # Create subplot titles
-    subplot_titles = []
-    for condition in conditions:
-        for axis in axis_columns:
-            subplot_titles.append(f"{condition} - {axis} axis")
+    subplot_titles = [
+        f"{condition} - {axis} axis"
+        for condition in conditions
+        for axis in axis_columns
+    ]
     
     # Create subplots
     fig = make_subplots(
@@ -141,47 +150,48 @@ def create_vibration_plot(all_data: Dict[str, pd.DataFrame],
         subplot_titles=subplot_titles,
         vertical_spacing=0.05,
         horizontal_spacing=0.03,
-        shared_xaxes='rows',  # Share x-axis (time) across columns
+        shared_xaxes='all',  # Share x-axis (time) across all subplots, ticks on bottom row only
     )
     
+    # Look up each column's color once
+    colors = [axis_colors[axis] for axis in axis_columns]
+    
     # Add traces for each condition and axis
     for row_idx, condition in enumerate(conditions, start=1):
         if condition not in all_data:
             print(f"⚠️  Warning: No data for condition '{condition}'")
             continue
         
+        # Get plain numpy arrays once per condition, so the traces don't
+        # go through pandas Series lookups and conversions per subplot.
+        # The axes come out as one (n_rows, n_axes) array.
         df = all_data[condition]
-        time_data = df[time_column]
+        time_data = df[time_column].to_numpy(copy=False)
+        axes_block = df[axis_columns].to_numpy(copy=False)
         
-        for col_idx, axis in enumerate(axis_columns, start=1):
-            # Add the trace
+        for col_idx, (axis, color) in enumerate(zip(axis_columns, colors), start=1):
+            # Add the trace (WebGL: stays responsive with many points)
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=time_data,
-                    y=df[axis],
+                    y=axes_block[:, col_idx - 1],
                     mode='lines',
                     name=f"{condition} - {axis}",
-                    line=dict(color=axis_colors[axis], width=1),
+                    line=dict(color=color, width=1),
                     showlegend=False,  # Too many traces for legend
                 ),
                 row=row_idx,
                 col=col_idx
             )
-            
-            # Update axes for this subplot
-            fig.update_xaxes(
-                title_text="Time (s)" if row_idx == n_conditions else "",
-                range=time_range,
-                row=row_idx,
-                col=col_idx
-            )
-            
-            fig.update_yaxes(
-                title_text="Acceleration" if col_idx == 1 else "",
-                range=global_ranges[axis],
-                row=row_idx,
-                col=col_idx
-            )
+    
+    # Update axes for the whole grid at once (one call per setting,
+    # rather than one per subplot)
+    fig.update_xaxes(range=time_range)
+    fig.update_xaxes(title_text="Time (s)", row=n_conditions)
+    
+    for col_idx, axis in enumerate(axis_columns, start=1):
+        fig.update_yaxes(range=global_ranges[axis], col=col_idx)
+    fig.update_yaxes(title_text="Acceleration", col=1)
     
     # Update overall layout
     total_height = plot_config['height_per_row'] * n_conditions
@@ -234,10 +244,11 @@ def create_frequency_plot(all_spectra: Dict[str, Dict],
     )
     
     # Create subplot titles
-    subplot_titles = []
-    for condition in conditions:
-        for axis in axis_columns:
-            subplot_titles.append(f"{condition} - {axis} axis")
+    subplot_titles = [
+        f"{condition} - {axis} axis"
+        for condition in conditions
+        for axis in axis_columns
+    ]
     
     # Create subplots
     fig = make_subplots(
@@ -246,7 +257,7 @@ def create_frequency_plot(all_spectra: Dict[str, Dict],
         subplot_titles=subplot_titles,
         vertical_spacing=0.05,
         horizontal_spacing=0.03,
-        shared_xaxes='rows',  # Share x-axis (frequency) across rows
+        shared_xaxes='all',  # Share x-axis (frequency) across all subplots, ticks on bottom row only
     )
     
     # Add traces for each condition and axis
@@ -257,14 +268,13 @@ def create_frequency_plot(all_spectra: Dict[str, Dict],
         
         spectrum = all_spectra[condition]
         
+        # Filter to max frequency (slices are views, no copy); all axes
+        # share the same frequency bins
+        cutoff = get_frequency_cutoff(spectrum, max_frequency)
+        freq_plot = spectrum['frequencies'][:cutoff]
+        
         for col_idx, axis in enumerate(axis_columns, start=1):
-            frequencies = spectrum[axis]['frequencies']
-            magnitudes = spectrum[axis]['magnitude']
-            
-            # Filter to max frequency
-            mask = frequencies <= max_frequency
-            freq_plot = frequencies[mask]
-            mag_plot = magnitudes[mask]
+            mag_plot = spectrum['magnitudes'][:cutoff, col_idx - 1]
             
             # Add the trace
             fig.add_trace(
@@ -282,21 +292,15 @@ def create_frequency_plot(all_spectra: Dict[str, Dict],
                 row=row_idx,
                 col=col_idx
             )
-            
-            # Update axes for this subplot
-            fig.update_xaxes(
-                title_text="Frequency (Hz)" if row_idx == n_conditions else "",
-                range=[0, max_frequency],
-                row=row_idx,
-                col=col_idx
-            )
-            
-            fig.update_yaxes(
-                title_text="Magnitude" if col_idx == 1 else "",
-                range=global_ranges[axis],
-                row=row_idx,
-                col=col_idx
-            )
+    
+    # Update axes for the whole grid at once (one call per setting,
+    # rather than one per subplot)
+    fig.update_xaxes(range=[0, max_frequency])
+    fig.update_xaxes(title_text="Frequency (Hz)", row=n_conditions)
+    
+    for col_idx, axis in enumerate(axis_columns, start=1):
+        fig.update_yaxes(range=global_ranges[axis], col=col_idx)
+    fig.update_yaxes(title_text="Magnitude", col=1)
     
     # Update overall layout
     total_height = plot_config['height_per_row'] * n_conditions
@@ -4,35 +4,90 @@ Optimized for performance and file size with rasterization.
 """
 
 import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 from pathlib import Path
 import logging
 
+from _kernels import column_ranges
+from config import TIME_COLUMN
+from signal_processor import get_frequency_cutoff
+
 logger = logging.getLogger(__name__)
 
+# Let Agg merge line segments that fall within one pixel of each other.
+# Dense vibration traces have far more points than pixels, so this cuts
+# rendering work without visible change.
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
 
-def downsample_data(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+def downsample_data(df: pd.DataFrame, factor: int,
+                    value_columns: List[str] = None) -> pd.DataFrame:
     """
-    Downsample DataFrame by keeping every Nth row.
+    Downsample DataFrame to about 1/factor of its rows, keeping the peaks.
+    
+    The rows are split into equal buckets, and for every value column
+    the row with the minimum and the row with the maximum in each bucket
+    are kept (min-max downsampling). Unlike keeping every Nth row, this
+    never drops a spike, which for vibration data is the signal. Buckets
+    are sized so the kept rows (union over all columns) stay within the
+    same point budget as keeping every Nth row.
     
     This dramatically reduces rendering time while maintaining
     visual fidelity (screens can't display millions of points anyway).
     
     Args:
         df: DataFrame to downsample
-        factor: Keep every Nth point (e.g., 10 = keep 10%)
+        factor: Reduction factor (e.g., 10 = keep about 10%)
+        value_columns: Columns whose peaks must be kept (default: all columns)
         
     Returns:
-        Downsampled DataFrame
+        Downsampled DataFrame (rows in original order, float64 value
+        columns other than the time column cast to float32)
     """
-    if factor <= 1:
+    if factor <= 1 or df.empty:
         return df
     
+    if value_columns is None:
+        value_columns = list(df.columns)
+    
     original_len = len(df)
-    downsampled = df.iloc[::factor].reset_index(drop=True)
+    
+    # Each column keeps 2 rows per bucket
+    bucket_size = 2 * factor * len(value_columns)
+    n_buckets = original_len // bucket_size
+    full_len = n_buckets * bucket_size
+    bucket_starts = np.arange(n_buckets) * bucket_size
+    
+    # Always keep the first and last rows so the time span is unchanged
+    kept = [np.array([0, original_len - 1])]
+    for column in value_columns:
+        values = df[column].to_numpy(copy=False)
+        
+        # Whole buckets, all at once
+        buckets = values[:full_len].reshape(n_buckets, bucket_size)
+        kept.append(bucket_starts + buckets.argmin(axis=1))
+        kept.append(bucket_starts + buckets.argmax(axis=1))
+        
+        # Leftover rows that don't fill a whole bucket
+        if full_len < original_len:
+            tail = values[full_len:]
+            kept.append(np.array([full_len + tail.argmin(), full_len + tail.argmax()]))
+    
+    # Sorted, without duplicates (a row can be a peak for several columns)
+    indices = np.unique(np.concatenate(kept))
+    downsampled = df.take(indices)
+    
+    # Plots don't need float64 precision at screen/print resolution, and
+    # float32 halves the bytes Matplotlib pushes through its path
+    # pipeline. The time column always keeps its dtype (TIME_DTYPE) for
+    # accurate axis labels, even when value_columns defaults to all columns.
+    downcast = {column: np.float32 for column in value_columns
+                if column != TIME_COLUMN and downsampled[column].dtype == np.float64}
+    if downcast:
+        downsampled = downsampled.astype(downcast)
     new_len = len(downsampled)
     
     logger.info(f"  Downsampled: {original_len:,} → {new_len:,} points ({new_len/original_len*100:.1f}%)")
@@ -56,13 +111,10 @@ def calculate_global_ranges_static(all_data: Dict[str, pd.DataFrame],
     """
     ranges = {}
     
-    for axis in axes:
-        all_values = []
-        for df in all_data.values():
-            all_values.extend(df[axis].values)
-        
-        min_val = np.min(all_values)
-        max_val = np.max(all_values)
+    # One (n_rows, n_axes) array per condition (a view, no copy)
+    blocks = [df[axes].to_numpy(copy=False) for df in all_data.values()]
+    
+    for axis, (min_val, max_val) in zip(axes, column_ranges(blocks)):
         padding = (max_val - min_val) * 0.05
         
         ranges[axis] = (min_val - padding, max_val + padding)
@@ -86,16 +138,14 @@ def calculate_global_frequency_ranges_static(all_spectra: Dict[str, Dict],
     """
     ranges = {}
     
-    for axis in axes:
-        all_magnitudes = []
+    for axis_idx, axis in enumerate(axes):
+        peak_magnitudes = []
         for spectrum in all_spectra.values():
-            frequencies = spectrum[axis]['frequencies']
-            magnitudes = spectrum[axis]['magnitude']
-            mask = frequencies <= max_frequency
-            all_magnitudes.extend(magnitudes[mask])
+            cutoff = get_frequency_cutoff(spectrum, max_frequency)
+            peak_magnitudes.append(spectrum['magnitudes'][:cutoff, axis_idx].max())
         
         min_mag = 0
-        max_mag = np.max(all_magnitudes)
+        max_mag = max(peak_magnitudes)
         padding = max_mag * 0.05
         
         ranges[axis] = (min_mag, max_mag + padding)
@@ -132,17 +182,19 @@ def create_time_domain_pdf(all_data: Dict[str, pd.DataFrame],
     print(f"  Downsampling data (factor: {pdf_config['downsample_factor']})...")
     downsampled_data = {}
     for condition, df in all_data.items():
-        downsampled_data[condition] = downsample_data(df, pdf_config['downsample_factor'])
+        downsampled_data[condition] = downsample_data(
+            df, pdf_config['downsample_factor'], axis_columns
+        )
     
     # Step 2: Calculate global ranges for consistent scaling
     print("  Calculating global ranges...")
     global_ranges = calculate_global_ranges_static(downsampled_data, axis_columns)
     
     # Calculate time range
-    all_times = []
-    for df in downsampled_data.values():
-        all_times.extend(df[time_column].values)
-    time_range = (min(all_times), max(all_times))
+    time_range = (
+        min(df[time_column].to_numpy(copy=False).min() for df in downsampled_data.values()),
+        max(df[time_column].to_numpy(copy=False).max() for df in downsampled_data.values())
+    )
     
     # Step 3: Create figure with subplots
     n_conditions = len(conditions)
@@ -150,15 +202,21 @@ def create_time_domain_pdf(all_data: Dict[str, pd.DataFrame],
     
     print(f"  Creating figure: {n_conditions} rows × {n_axes} columns")
     
-    # Create figure with specified size
-    fig = plt.figure(figsize=pdf_config['figsize'], dpi=pdf_config['dpi'])
-    
-    # Create grid specification for subplots
-    gs = gridspec.GridSpec(
+    # Create the whole grid of subplots at once.
+    # All plots share the time axis, and each column (axis) shares its
+    # Y range, so limits and tick formatters are set up once per group.
+    fig, axes = plt.subplots(
         n_conditions, n_axes,
-        figure=fig,
-        hspace=pdf_config['hspace'],  # Vertical spacing
-        wspace=pdf_config['wspace']   # Horizontal spacing
+        figsize=pdf_config['figsize'],
+        dpi=pdf_config['dpi'],
+        sharex=True,
+        sharey='col',
+        squeeze=False,
+        gridspec_kw={
+            'hspace': pdf_config['hspace'],  # Vertical spacing
+            'wspace': pdf_config['wspace'],  # Horizontal spacing
+            **pdf_config['margins'],         # Fixed layout, no tight-bbox pass
+        }
     )
     
     # Add overall title
@@ -170,23 +228,36 @@ def create_time_domain_pdf(all_data: Dict[str, pd.DataFrame],
     
     # Step 4: Plot data in each subplot
     print("  Plotting data...")
+    colors = [axis_colors[axis] for axis in axis_columns]
+    
+    # Shared x-axes only label the bottom row, so label the lowest row
+    # that has data (the last rows may be hidden)
+    bottom_row = max(
+        (row_idx for row_idx, condition in enumerate(conditions) if condition in downsampled_data),
+        default=None
+    )
+    
     for row_idx, condition in enumerate(conditions):
         if condition not in downsampled_data:
             logger.warning(f"No data for condition: {condition}")
+            for ax in axes[row_idx]:
+                ax.set_visible(False)
             continue
         
+        # Get plain numpy arrays once per condition: the axes come out
+        # as one (n_rows, n_axes) array, one column per subplot
         df = downsampled_data[condition]
-        time_data = df[time_column].values
+        time_data = df[time_column].to_numpy(copy=False)
+        axes_block = df[axis_columns].to_numpy(copy=False)
         
-        for col_idx, axis in enumerate(axis_columns):
-            # Create subplot
-            ax = fig.add_subplot(gs[row_idx, col_idx])
+        for col_idx, (axis, color) in enumerate(zip(axis_columns, colors)):
+            ax = axes[row_idx, col_idx]
             
             # Plot the data with rasterization
             ax.plot(
                 time_data,
-                df[axis].values,
-                color=axis_colors[axis],
+                axes_block[:, col_idx],
+                color=color,
                 linewidth=pdf_config['line_width'],
                 rasterized=pdf_config['rasterized']  # Rasterize for smaller file
             )
@@ -203,8 +274,9 @@ def create_time_domain_pdf(all_data: Dict[str, pd.DataFrame],
                 fontsize=pdf_config['title_size']
             )
             
-            # Add X-axis label only on bottom row
-            if row_idx == n_conditions - 1:
+            # Add X-axis tick labels and label only on the bottom row
+            if row_idx == bottom_row:
+                ax.tick_params(labelbottom=True)
                 ax.set_xlabel('Time (s)', fontsize=pdf_config['label_size'])
             
             # Add Y-axis label only on left column
@@ -222,7 +294,7 @@ def create_time_domain_pdf(all_data: Dict[str, pd.DataFrame],
     plt.savefig(
         output_path,
         dpi=pdf_config['dpi'],
-        bbox_inches='tight',  # Remove extra whitespace
+        bbox_inches=pdf_config['bbox_inches'],
         format='pdf'
     )
     
@@ -265,13 +337,18 @@ def create_frequency_domain_pdf(all_spectra: Dict[str, Dict],
     
     print(f"  Creating figure: {n_conditions} rows × {n_axes} columns")
     
-    fig = plt.figure(figsize=pdf_config['figsize'], dpi=pdf_config['dpi'])
-    
-    gs = gridspec.GridSpec(
+    fig, axes = plt.subplots(
         n_conditions, n_axes,
-        figure=fig,
-        hspace=pdf_config['hspace'],
-        wspace=pdf_config['wspace']
+        figsize=pdf_config['figsize'],
+        dpi=pdf_config['dpi'],
+        sharex=True,
+        sharey='col',
+        squeeze=False,
+        gridspec_kw={
+            'hspace': pdf_config['hspace'],
+            'wspace': pdf_config['wspace'],
+            **pdf_config['margins'],
+        }
     )
     
     fig.suptitle(
@@ -282,24 +359,32 @@ def create_frequency_domain_pdf(all_spectra: Dict[str, Dict],
     
     # Step 3: Plot frequency spectra
     print("  Plotting frequency spectra...")
+    
+    # Shared x-axes only label the bottom row, so label the lowest row
+    # that has data (the last rows may be hidden)
+    bottom_row = max(
+        (row_idx for row_idx, condition in enumerate(conditions) if condition in all_spectra),
+        default=None
+    )
+    
     for row_idx, condition in enumerate(conditions):
         if condition not in all_spectra:
             logger.warning(f"No spectrum for condition: {condition}")
+            for ax in axes[row_idx]:
+                ax.set_visible(False)
             continue
         
         spectrum = all_spectra[condition]
         
+        # Filter to max frequency (slices are views, no copy); all axes
+        # share the same frequency bins
+        cutoff = get_frequency_cutoff(spectrum, max_frequency)
+        freq_plot = spectrum['frequencies'][:cutoff]
+        
         for col_idx, axis in enumerate(axis_columns):
-            frequencies = spectrum[axis]['frequencies']
-            magnitudes = spectrum[axis]['magnitude']
-            
-            # Filter to max frequency
-            mask = frequencies <= max_frequency
-            freq_plot = frequencies[mask]
-            mag_plot = magnitudes[mask]
+            mag_plot = spectrum['magnitudes'][:cutoff, col_idx]
             
-            # Create subplot
-            ax = fig.add_subplot(gs[row_idx, col_idx])
+            ax = axes[row_idx, col_idx]
             
             # Plot with filled area (like Plotly version)
             ax.plot(
@@ -329,8 +414,9 @@ def create_frequency_domain_pdf(all_spectra: Dict[str, Dict],
                 fontsize=pdf_config['title_size']
             )
             
-            # Add labels
-            if row_idx == n_conditions - 1:
+            # Add labels (X-axis tick labels and label only on the bottom row)
+            if row_idx == bottom_row:
+                ax.tick_params(labelbottom=True)
                 ax.set_xlabel('Frequency (Hz)', fontsize=pdf_config['label_size'])
             
             if col_idx == 0:
@@ -347,7 +433,7 @@ def create_frequency_domain_pdf(all_spectra: Dict[str, Dict],
     plt.savefig(
         output_path,
         dpi=pdf_config['dpi'],
-        bbox_inches='tight',
+        bbox_inches=pdf_config['bbox_inches'],
         format='pdf'
     )
     
@@ -2,11 +2,27 @@
 Module for signal processing operations including FFT analysis.
 """
 
+import contextlib
 import numpy as np
 import pandas as pd
+import scipy.fft
 from scipy import signal
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, List, Tuple
 import logging
+import os
+
+# Optional: use FFTW for the FFTs inside Welch's method if pyfftw is
+# installed (faster for power-of-2 window sizes). The plan cache keeps
+# FFTW plans around, so planning is paid once per window size.
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+    pyfftw.interfaces.cache.enable()
+except ImportError:
+    pyfftw = None
+
+from _kernels import scale_magnitude, find_peak
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +40,16 @@ def calculate_sampling_rate(time_data: np.ndarray) -> float:
     Returns:
         Sampling rate in Hz
     """
-    # Calculate time differences between consecutive samples
-    time_diffs = np.diff(time_data)
-    
-    # Average time step (should be consistent for uniform sampling)
-    avg_dt = np.mean(time_diffs)
+    # Average time step (should be consistent for uniform sampling).
+    # The mean of consecutive differences telescopes to
+    # (last - first) / (N - 1), so no array of differences is needed.
+    avg_dt = (time_data[-1] - time_data[0]) / (len(time_data) - 1)
     
     # Sampling rate is 1 / time_step
     fs = 1.0 / avg_dt
     
-    logger.info(f"  Calculated sampling rate: {fs:.2f} Hz")
-    logger.info(f"  Average time step: {avg_dt*1000:.4f} ms")
+    logger.debug("  Calculated sampling rate: %.2f Hz", fs)
+    logger.debug("  Average time step: %.4f ms", avg_dt * 1000)
     
     return fs
 
@@ -63,101 +78,248 @@ def compute_frequency_spectrum(df: pd.DataFrame,
         Dictionary containing:
         - 'sampling_rate': Sampling frequency
         - 'nyquist_freq': Maximum meaningful frequency
-        - For each axis: {'frequencies': array, 'magnitude': array}
+        - 'frequencies': Frequency bins (shared by all axes)
+        - 'magnitudes': Array of shape (n_freqs, n_axes), one column per
+          axis in axis_columns order (spectrum['magnitudes'][:, axis_idx])
+        - 'cutoff_idx': Number of bins up to the configured max frequency
+    """
+    time_data, signals = _spectrum_inputs(df, time_column, axis_columns)
+    return _compute_spectrum_from_arrays(time_data, signals, axis_columns, fft_config)
+
+
+def _spectrum_inputs(df: pd.DataFrame,
+                     time_column: str,
+                     axis_columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract the arrays a spectrum is computed from.
+    
+    Args:
+        df: DataFrame with time series data
+        time_column: Name of time column
+        axis_columns: List of axis names
+        
+    Returns:
+        (time array, axis signals of shape (n_axes, N)). The loader keeps
+        the axes in one block, so the signals are normally a view.
+    """
+    time_data = df[time_column].to_numpy(copy=False)
+    signals = np.ascontiguousarray(df[axis_columns].to_numpy(copy=False).T)
+    return time_data, signals
+
+
+def _compute_spectrum_from_arrays(time_data: np.ndarray,
+                                  signals: np.ndarray,
+                                  axis_columns: List[str],
+                                  fft_config: Dict) -> Dict:
+    """
+    Compute the spectrum of one condition from plain arrays.
+    
+    Kept at module level, taking arrays rather than a DataFrame, so it
+    can be sent to worker processes cheaply.
+    
+    Args:
+        time_data: Array of time values
+        signals: Axis signals, shape (n_axes, N) in axis_columns order
+        axis_columns: List of axis names (for logging)
+        fft_config: Configuration dictionary for FFT parameters
+        
+    Returns:
+        Spectrum dictionary (see compute_frequency_spectrum)
     """
     # Step 1: Calculate sampling rate from time data
-    time_data = df[time_column].values
     fs = calculate_sampling_rate(time_data)
     
     # Nyquist frequency = half the sampling rate (max frequency we can detect)
     nyquist_freq = fs / 2.0
-    logger.info(f"  Nyquist frequency: {nyquist_freq:.2f} Hz")
+    logger.debug("  Nyquist frequency: %.2f Hz", nyquist_freq)
     
-    # Initialize results dictionary
-    result = {
-        'sampling_rate': fs,
-        'nyquist_freq': nyquist_freq
-    }
+    # Step 2: Compute spectra for all axes in one batched Welch call
+    # Axes as rows (n_axes, N): Welch runs along the last axis, so every
+    # segment's FFT covers all axes at once
+    signal_length = signals.shape[1]
     
-    # Step 2: Compute spectrum for each axis
-    for axis in axis_columns:
-        signal_data = df[axis].values
-        
-        # Determine window size (can't be larger than signal length)
-        nperseg = min(fft_config['nperseg'], len(signal_data))
-        overlap = min(fft_config['overlap'], nperseg - 1)
-        
-        logger.info(f"  Computing FFT for {axis} axis...")
-        logger.info(f"    Signal length: {len(signal_data)} samples")
-        logger.info(f"    Window size: {nperseg} samples")
-        logger.info(f"    Overlap: {overlap} samples")
-        
-        # Compute Power Spectral Density using Welch's method
+    # Determine window size: rounded up to a power of 2 (fastest FFT size),
+    # but can't be larger than signal length
+    nperseg = 1 << (int(fft_config['nperseg']) - 1).bit_length()
+    nperseg = min(nperseg, signal_length)
+    overlap = min(fft_config['overlap'], nperseg - 1)
+    
+    logger.debug("  Computing FFT for %s axes...", ", ".join(axis_columns))
+    logger.debug("    Signal length: %d samples", signal_length)
+    logger.debug("    Window size: %d samples", nperseg)
+    logger.debug("    Overlap: %d samples", overlap)
+    
+    # Hann window reduces spectral leakage (built once, shared by all axes)
+    window = signal.get_window('hann', nperseg)
+    
+    # Route the FFTs through FFTW when available
+    if pyfftw is not None:
+        fft_backend = scipy.fft.set_backend(pyfftw.interfaces.scipy_fft)
+    else:
+        fft_backend = contextlib.nullcontext()
+    
+    # Compute Power Spectral Density using Welch's method
+    with fft_backend:
         frequencies, psd = signal.welch(
-            signal_data,
+            signals,
             fs=fs,
+            window=window,
             nperseg=nperseg,
             noverlap=overlap,
             scaling='density',  # Power spectral density
-            window='hann'       # Hann window reduces spectral leakage
+            axis=-1
         )
-        
-        # Convert PSD to magnitude (amplitude)
-        # PSD units are (acceleration^2)/Hz
-        # Magnitude units are acceleration
-        magnitude = np.sqrt(psd * fs / 2)  # Scale to get amplitude
-        
-        # Store results
-        result[axis] = {
-            'frequencies': frequencies,
-            'magnitude': magnitude
-        }
-        
-        # Log some stats
-        peak_freq = frequencies[np.argmax(magnitude)]
-        peak_mag = np.max(magnitude)
-        logger.info(f"    Peak frequency: {peak_freq:.2f} Hz")
-        logger.info(f"    Peak magnitude: {peak_mag:.4f}")
+    
+    # Index of the first bin above the configured max frequency.
+    # Frequencies are sorted, so plots can slice [:cutoff_idx] (a view)
+    # instead of building a boolean mask.
+    max_frequency = fft_config['max_frequency']
+    if max_frequency is None:
+        cutoff_idx = len(frequencies)
+    else:
+        cutoff_idx = int(np.searchsorted(frequencies, max_frequency, side='right'))
+    
+    # Convert PSD to magnitude (amplitude), in place in the PSD buffer
+    # PSD units are (acceleration^2)/Hz
+    # Magnitude units are acceleration
+    magnitudes = scale_magnitude(psd, fs)  # sqrt(psd * fs / 2)
+    
+    # Store results: one 2-D array for all axes instead of a dict per
+    # axis. The transpose is a view, so each axis column
+    # (magnitudes[:, axis_idx]) is still contiguous in memory.
+    result = {
+        'sampling_rate': fs,
+        'nyquist_freq': nyquist_freq,
+        'frequencies': frequencies,
+        'magnitudes': magnitudes.T,
+        'cutoff_idx': cutoff_idx
+    }
+    
+    # Log some stats (only computed when debug logging is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        for axis_idx, axis in enumerate(axis_columns):
+            peak_freq, peak_mag = find_peak(magnitudes[axis_idx], frequencies)
+            logger.debug("    %s peak frequency: %.2f Hz", axis, peak_freq)
+            logger.debug("    %s peak magnitude: %.4f", axis, peak_mag)
     
     return result
 
 
+def get_frequency_cutoff(spectrum: Dict, max_frequency: float) -> int:
+    """
+    Get the number of spectrum bins at or below a frequency.
+    
+    Uses the cached 'cutoff_idx' when it already matches max_frequency
+    (checked in O(1)), otherwise does a binary search on the sorted
+    frequencies. Slice with [:cutoff] to get views of the data.
+    
+    Args:
+        spectrum: Spectrum of one condition (from compute_frequency_spectrum)
+        max_frequency: Maximum frequency to include
+        
+    Returns:
+        Number of leading bins with frequency <= max_frequency
+    """
+    frequencies = spectrum['frequencies']
+    cutoff = spectrum['cutoff_idx']
+    
+    # Cached index is valid if it splits the bins exactly at max_frequency
+    below_ok = cutoff == 0 or frequencies[cutoff - 1] <= max_frequency
+    above_ok = cutoff == len(frequencies) or frequencies[cutoff] > max_frequency
+    if below_ok and above_ok:
+        return cutoff
+    
+    return int(np.searchsorted(frequencies, max_frequency, side='right'))
+
+
 def compute_all_frequency_spectra(all_data: Dict[str, pd.DataFrame],
                                   time_column: str,
                                   axis_columns: List[str],
-                                  fft_config: Dict) -> Dict[str, Dict]:
+                                  fft_config: Dict,
+                                  verbose: bool = False) -> Tuple[Dict[str, Dict], Dict]:
     """
     Compute frequency spectra for all conditions.
     
+    Logs one summary line per condition; per-axis details are logged
+    at DEBUG level.
+    
     Args:
         all_data: Dictionary mapping condition names to DataFrames
         time_column: Name of time column
         axis_columns: List of axis names
         fft_config: FFT configuration
+        verbose: Print a banner and a header per condition
         
     Returns:
-        Dictionary mapping condition names to frequency spectrum results
+        Tuple of:
+        - Dictionary mapping condition names to frequency spectrum results
+        - Metadata computed once over all conditions:
+          {'min_nyquist': lowest Nyquist frequency of any condition}
     """
-    all_spectra = {}
+    if verbose:
+        print("\n" + "="*80)
+        print("COMPUTING FREQUENCY SPECTRA")
+        print("="*80)
     
-    print("\n" + "="*80)
-    print("COMPUTING FREQUENCY SPECTRA")
-    print("="*80)
+    if not all_data:
+        return {}, {}
     
-    for condition, df in all_data.items():
-        print(f"\nProcessing: {condition}")
-        print("-" * 60)
-        
-        spectrum = compute_frequency_spectrum(
-            df, time_column, axis_columns, fft_config
-        )
-        
-        all_spectra[condition] = spectrum
+    # Conditions are independent, so each one is computed in its own
+    # worker process. Only the time array and the axis block are sent to
+    # the workers. With a single worker, a pool would only add process
+    # startup and pickling, so everything runs inline instead.
+    max_workers = min(len(all_data), os.cpu_count() or 1)
+    
+    spectra_by_condition = {}
+    if max_workers <= 1:
+        for condition, df in all_data.items():
+            if verbose:
+                print(f"\nProcessing: {condition}")
+                print("-" * 60)
+            
+            spectra_by_condition[condition] = compute_frequency_spectrum(
+                df, time_column, axis_columns, fft_config
+            )
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for condition, df in all_data.items():
+                if verbose:
+                    print(f"\nProcessing: {condition}")
+                    print("-" * 60)
+                
+                time_data, signals = _spectrum_inputs(df, time_column, axis_columns)
+                future = executor.submit(
+                    _compute_spectrum_from_arrays,
+                    time_data, signals, axis_columns, fft_config
+                )
+                futures[future] = condition
+            
+            for future in as_completed(futures):
+                spectra_by_condition[futures[future]] = future.result()
+    
+    # Keep the same order as all_data
+    all_spectra = {condition: spectra_by_condition[condition] for condition in all_data}
+    
+    # One summary line per condition (peaks only searched when logged)
+    if logger.isEnabledFor(logging.INFO):
+        for condition, spectrum in all_spectra.items():
+            peaks = ", ".join(
+                f"{axis}={find_peak(spectrum['magnitudes'][:, axis_idx], spectrum['frequencies'])[0]:.2f} Hz"
+                for axis_idx, axis in enumerate(axis_columns)
+            )
+            logger.info("  %s: fs=%.2f Hz, peak frequencies: %s",
+                        condition, spectrum['sampling_rate'], peaks)
+    
+    # Aggregates needed later, computed once here
+    spectra_meta = {
+        'min_nyquist': min(spec['nyquist_freq'] for spec in all_spectra.values())
+    }
     
-    return all_spectra
+    return all_spectra, spectra_meta
 
 
-def get_frequency_display_range(all_spectra: Dict[str, Dict],
+def get_frequency_display_range(spectra_meta: Dict,
                                 fft_config: Dict) -> float:
     """
     Determine the maximum frequency to display in plots.
@@ -165,14 +327,14 @@ def get_frequency_display_range(all_spectra: Dict[str, Dict],
     Uses either the configured max or the Nyquist frequency.
     
     Args:
-        all_spectra: Dictionary of frequency spectra for all conditions
+        spectra_meta: Metadata from compute_all_frequency_spectra
         fft_config: FFT configuration
         
     Returns:
         Maximum frequency to display (Hz)
     """
-    # Get the minimum Nyquist frequency across all conditions
-    min_nyquist = min(spec['nyquist_freq'] for spec in all_spectra.values())
+    # Minimum Nyquist frequency across all conditions
+    min_nyquist = spectra_meta['min_nyquist']
     
     # Use configured max or Nyquist
     if fft_config['max_frequency'] is not None: